@@ -10,11 +10,16 @@ Architecture:
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
 import duckdb
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+import threading
 
 # Database path - can be overridden via environment variable for Docker
 import os
@@ -40,13 +45,63 @@ app.add_middleware(
 # Database Helpers
 # =============================================================================
 
+# Single process-wide database handle. Opening a DuckDB file is expensive
+# (file handles, catalog load, buffer pool), so it is done once at import
+# and each caller gets a cheap cursor on top of it.
+#
+# There is deliberately no separate read_only=True handle for GETs: DuckDB
+# refuses to open a file already held by this process with a different
+# configuration, and a second instance wouldn't see this one's writes anyway.
+# Reads instead use per-thread cursors that never take the write lock, and
+# the SQL console runs in a READ ONLY transaction.
+#
+# Because the handle stays open, DuckDB would otherwise leave every write in
+# hk_checklist.db.wal until shutdown, and a copy of the .db file (what
+# scripts/backup.sh takes) would miss it. A zero checkpoint threshold merges
+# the WAL into the .db after each commit; if a console query still holds a
+# transaction open, that checkpoint is skipped and caught up on the next one.
+def open_database():
+    """Open the process-wide DuckDB handle."""
+    return duckdb.connect(str(DB_PATH), config={"checkpoint_threshold": "0b"})
+
+
+_DB = open_database()
+
+# Sync endpoints run on FastAPI's threadpool, so each worker thread keeps its
+# own cursor for parallel reads. Writes are serialized through a single lock,
+# re-entrant so callers can also cover in-memory cache updates with it.
+_local = threading.local()
+_write_lock = threading.RLock()
+
+
 def get_connection():
     """
-    Get a DuckDB connection.
-    DuckDB handles concurrent reads well, but writes need care.
-    For a local single-user app, this is sufficient.
+    Get the calling thread's cursor on the shared DuckDB connection.
+    DuckDB handles concurrent reads well, but writes need care:
+    hold _write_lock around any mutation.
+
+    The cursor is reused for the lifetime of the thread; do not close it.
+    """
+    con = getattr(_local, "con", None)
+    # Cursors belong to the handle they came from; after a shutdown/startup
+    # cycle the handle is new, so stale cursors are replaced
+    if con is None or _local.db is not _DB:
+        con = _local.con = _DB.cursor()
+        _local.db = _DB
+        _local.prepared = set()
+    return con
+
+
+def fetch_dicts(result):
+    """
+    Fetch all rows of an executed statement as a list of dicts.
     """
-    return duckdb.connect(str(DB_PATH))
+    # Get column names
+    columns = [desc[0] for desc in result.description]
+    rows = result.fetchall()
+    
+    # Convert to list of dicts
+    return [dict(zip(columns, row)) for row in rows]
 
 
 def execute_query(sql: str, params: list = None):
@@ -54,34 +109,126 @@ def execute_query(sql: str, params: list = None):
     Execute a query and return results as list of dicts.
     """
     con = get_connection()
-    try:
-        if params:
-            result = con.execute(sql, params)
-        else:
-            result = con.execute(sql)
-        
-        # Get column names
-        columns = [desc[0] for desc in result.description]
-        rows = result.fetchall()
-        
-        # Convert to list of dicts
-        return [dict(zip(columns, row)) for row in rows]
-    finally:
-        con.close()
+    if params:
+        result = con.execute(sql, params)
+    else:
+        result = con.execute(sql)
+    
+    return fetch_dicts(result)
 
 
-def execute_write(sql: str, params: list = None):
+def execute_write(sql: str, params: list = None, returning: bool = False):
     """
     Execute a write query (INSERT, UPDATE, DELETE).
+    
+    With returning=True, returns the rows produced by the statement's
+    RETURNING clause as a list of dicts, so callers can mutate and re-read
+    in one round-trip.
     """
     con = get_connection()
-    try:
+    with _write_lock:
         if params:
-            con.execute(sql, params)
+            result = con.execute(sql, params)
         else:
-            con.execute(sql)
-    finally:
-        con.close()
+            result = con.execute(sql)
+        
+        if returning:
+            return fetch_dicts(result)
+
+
+# Hot-path statements, keyed by name. DuckDB prepared statements belong to a
+# connection, so each thread's cursor prepares them lazily on first use.
+PREPARED_STATEMENTS = {
+    "get_item": "SELECT id, found, name, category, region, information, location_url FROM hk WHERE id = $1",
+    "update_item_found": """
+        UPDATE hk SET found = $1 WHERE id = $2
+        RETURNING id, found, name, category, region, information, location_url
+    """,
+    "get_session": "SELECT id, name, created_at, saved_at FROM sessions WHERE id = $1",
+    "get_session_state": "SELECT id, saved_at FROM sessions WHERE id = $1",
+    "get_session_items": "SELECT item_id, added_at FROM session_items WHERE session_id = $1 ORDER BY added_at",
+}
+
+
+def _sql_literal(value) -> str:
+    """Render an EXECUTE argument. EXECUTE can't take bound parameters, so only ints and bools are accepted."""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, int):
+        return str(value)
+    raise TypeError(f"Unsupported prepared statement argument: {value!r}")
+
+
+def execute_prepared(name: str, args: list, write: bool = False):
+    """
+    Execute a statement from PREPARED_STATEMENTS and return results as list of dicts.
+    
+    After the first call on a thread, DuckDB skips parsing, binding and
+    planning. Pass write=True for mutations so they take the write lock.
+    """
+    con = get_connection()
+    if name not in _local.prepared:
+        con.execute(f"PREPARE {name} AS {PREPARED_STATEMENTS[name]}")
+        _local.prepared.add(name)
+    
+    sql = f"EXECUTE {name}({', '.join(_sql_literal(arg) for arg in args)})"
+    if write:
+        with _write_lock:
+            return fetch_dicts(con.execute(sql))
+    return fetch_dicts(con.execute(sql))
+
+
+# Reference data. No endpoint changes an item's category, region or other
+# descriptive columns (only found), so these are loaded once, at startup or on
+# first use if hk didn't exist yet (db-init still running on a fresh volume).
+# _FOUND holds the live found flag and is updated alongside every write to it.
+_reference_loaded = False
+_CATEGORIES: list[str] = []
+_REGIONS: list[str] = []
+_ITEMS_STATIC: list[dict] = []
+_ITEMS_STATIC_BY_ID: dict[int, dict] = {}
+_FOUND: dict[int, bool] = {}
+
+
+def load_reference_data():
+    """Cache the distinct categories and regions, and all items, of hk."""
+    con = get_connection()
+    _CATEGORIES[:] = [row[0] for row in con.execute("SELECT DISTINCT category FROM hk ORDER BY category").fetchall()]
+    _REGIONS[:] = [row[0] for row in con.execute("SELECT DISTINCT region FROM hk ORDER BY region").fetchall()]
+    
+    with _write_lock:
+        items = fetch_dicts(con.execute(
+            "SELECT id, found, name, category, region, information, location_url FROM hk ORDER BY id"
+        ))
+        _FOUND.clear()
+        for item in items:
+            _FOUND[item["id"]] = item.pop("found")
+        _ITEMS_STATIC[:] = items
+        _ITEMS_STATIC_BY_ID.clear()
+        _ITEMS_STATIC_BY_ID.update((item["id"], item) for item in items)
+
+
+def ensure_reference_data() -> bool:
+    """
+    Load the reference caches unless they already are.
+    Returns False while the hk table doesn't exist yet.
+    """
+    global _reference_loaded
+    if not _reference_loaded:
+        with _write_lock:
+            if not _reference_loaded:
+                try:
+                    load_reference_data()
+                except duckdb.CatalogException:
+                    return False
+                _reference_loaded = True
+    return True
+
+
+def require_reference_data():
+    """Raise 503 if the reference caches can't be loaded because hk is missing."""
+    if not ensure_reference_data():
+        raise HTTPException(status_code=503, detail="Checklist database is not initialized")
 
 
 # =============================================================================
@@ -103,6 +250,45 @@ class SQLResponse(BaseModel):
     columns: list[str]
     rows: list[list]
     row_count: int
+    # Set when the query fails after rows have started streaming
+    error: Optional[str] = None
+
+
+class Item(BaseModel):
+    """A checklist item."""
+    id: int
+    found: bool
+    name: str
+    category: str
+    region: str
+    information: Optional[str]
+    location_url: Optional[str]
+
+
+class SessionItem(Item):
+    """A checklist item within a session."""
+    added_at: datetime
+
+
+class SessionSummary(BaseModel):
+    """A session without its items."""
+    id: int
+    name: str
+    created_at: datetime
+    saved_at: Optional[datetime]
+    item_count: int
+
+
+class SessionDetail(SessionSummary):
+    """A session with its items."""
+    items: list[SessionItem]
+
+
+class SessionAck(BaseModel):
+    """Acknowledgement of a session mutation."""
+    ok: bool
+    session_id: int
+    item_count: int
 
 
 class SessionCreate(BaseModel):
@@ -119,7 +305,7 @@ class SessionItemAdd(BaseModel):
 # API Endpoints
 # =============================================================================
 
-@app.get("/items")
+@app.get("/items", response_model=list[Item])
 def get_items(
     found: Optional[bool] = Query(None, description="Filter by found status"),
     category: Optional[str] = Query(None, description="Filter by category"),
@@ -130,8 +316,12 @@ def get_items(
     Get all items with optional filters.
     
     Filters are applied via WHERE clauses with parameterized queries
-    to prevent SQL injection.
+    to prevent SQL injection. The unfiltered list is served from memory.
     """
+    if found is None and not category and not region and not name:
+        require_reference_data()
+        return [{**item, "found": _FOUND[item["id"]]} for item in _ITEMS_STATIC]
+    
     # Build query dynamically with parameterized values
     sql = "SELECT id, found, name, category, region, information, location_url FROM hk WHERE 1=1"
     params = []
@@ -149,8 +339,9 @@ def get_items(
         params.append(region)
     
     if name:
-        # Case-insensitive partial match
-        sql += " AND LOWER(name) LIKE LOWER(?)"
+        # Case-insensitive partial match; ILIKE folds case while matching
+        # instead of lowercasing a copy of every row's name
+        sql += " AND name ILIKE ?"
         params.append(f"%{name}%")
     
     sql += " ORDER BY id"
@@ -158,13 +349,10 @@ def get_items(
     return execute_query(sql, params)
 
 
-@app.get("/items/{item_id}")
+@app.get("/items/{item_id}", response_model=Item)
 def get_item(item_id: int):
     """Get a single item by ID."""
-    result = execute_query(
-        "SELECT id, found, name, category, region, information, location_url FROM hk WHERE id = ?",
-        [item_id]
-    )
+    result = execute_prepared("get_item", [item_id])
     
     if not result:
         raise HTTPException(status_code=404, detail="Item not found")
@@ -172,7 +360,7 @@ def get_item(item_id: int):
     return result[0]
 
 
-@app.patch("/items/{item_id}")
+@app.patch("/items/{item_id}", response_model=Item)
 def update_item(item_id: int, update: ItemUpdate):
     """
     Update an item's found status.
@@ -180,165 +368,265 @@ def update_item(item_id: int, update: ItemUpdate):
     Immediately persists to DuckDB.
     Returns the updated item.
     """
-    # Verify item exists
-    existing = execute_query("SELECT id FROM hk WHERE id = ?", [item_id])
-    if not existing:
-        raise HTTPException(status_code=404, detail="Item not found")
+    # Update and read back in one statement; no row means no such item
+    with _write_lock:
+        result = execute_prepared("update_item_found", [update.found, item_id], write=True)
+        if result:
+            _FOUND[item_id] = result[0]["found"]
     
-    # Update the found status
-    execute_write(
-        "UPDATE hk SET found = ? WHERE id = ?",
-        [update.found, item_id]
-    )
+    if not result:
+        raise HTTPException(status_code=404, detail="Item not found")
     
-    # Return updated item
-    return execute_query(
-        "SELECT id, found, name, category, region, information, location_url FROM hk WHERE id = ?",
-        [item_id]
-    )[0]
+    return result[0]
+
+
+# Console queries are arbitrary and can be slow, so they run on their own
+# small pool instead of FastAPI's shared threadpool. A heavy query then
+# can't starve the item and session endpoints of workers.
+_SQL_EXEC = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sql-console")
+
 
+# Console results are streamed in batches of this many rows, so memory use
+# is bounded by the batch rather than the size of the result
+SQL_BATCH_ROWS = 10_000
 
-@app.post("/sql", response_model=SQLResponse)
-def execute_sql(query: SQLQuery):
+# Encodes rows exactly as the SQLResponse model would (datetimes, decimals, UUIDs...)
+_json_list = TypeAdapter(list)
+
+
+@app.post("/sql", response_class=StreamingResponse, responses={200: {"model": SQLResponse}})
+async def execute_sql(query: SQLQuery):
     """
     Execute a read-only SQL query.
     
     SECURITY: Only SELECT statements are allowed.
     This is for the embedded SQL console feature.
+    
+    The response body is a single SQLResponse JSON document, streamed
+    batch by batch with row_count written last. If the query fails after
+    streaming has started, the document ends with the rows sent so far
+    and an "error" message instead of a 400.
     """
-    sql = query.query.strip()
+    loop = asyncio.get_running_loop()
+    con, columns, batch = await loop.run_in_executor(_SQL_EXEC, open_console_query, query.query)
+    return StreamingResponse(
+        stream_console_rows(con, columns, batch),
+        media_type="application/json"
+    )
+
+
+def open_console_query(sql: str):
+    """
+    Validate and start a SQL console query. Runs on _SQL_EXEC.
     
-    # Validate query is SELECT only
-    # Check first word after stripping whitespace
-    first_word = sql.split()[0].upper() if sql.split() else ""
+    Returns the query's own cursor, its column names and the first encoded
+    batch of rows. Fetching the first batch here means most query errors
+    surface as a 400 before the response starts streaming.
+    """
+    sql = sql.strip()
+    # A dedicated cursor: the result stays open across executor threads
+    # while it streams, so it can't share a thread's cursor
+    con = _DB.cursor()
     
-    if first_word != "SELECT":
+    # Validate with DuckDB's own parser: exactly one SELECT statement.
+    # This also rejects stacked statements such as "SELECT 1; DROP TABLE hk".
+    try:
+        statements = con.extract_statements(sql)
+    except Exception as e:
+        con.close()
+        raise HTTPException(status_code=400, detail=f"Query error: {str(e)}")
+    
+    if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+        con.close()
         raise HTTPException(
             status_code=400,
-            detail="Only SELECT queries are allowed. Write operations are not permitted through the SQL console."
+            detail="Only a single SELECT query is allowed. Write operations are not permitted through the SQL console."
         )
     
-    # Additional safety: reject queries with dangerous keywords
-    # This is defense-in-depth; the SELECT check should be sufficient
-    dangerous_keywords = ["INSERT", "UPDATE", "DELETE", "DROP", "CREATE", "ALTER", "TRUNCATE", "GRANT", "REVOKE"]
-    sql_upper = sql.upper()
-    for keyword in dangerous_keywords:
-        # Check for keyword as a word boundary (not part of another word)
-        if f" {keyword} " in f" {sql_upper} ":
-            raise HTTPException(
-                status_code=400,
-                detail=f"Query contains forbidden keyword: {keyword}"
-            )
-    
+    # Defense-in-depth: run inside a read-only transaction so DuckDB itself
+    # refuses any write the query might still attempt. The transaction is
+    # rolled back when the cursor is closed.
     try:
-        con = get_connection()
+        con.execute("BEGIN TRANSACTION READ ONLY")
         result = con.execute(sql)
         
         columns = [desc[0] for desc in result.description]
-        rows = result.fetchall()
-        
-        con.close()
-        
-        return SQLResponse(
-            columns=columns,
-            rows=[list(row) for row in rows],
-            row_count=len(rows)
-        )
+        return con, columns, fetch_console_batch(con)
     except Exception as e:
+        con.close()
         raise HTTPException(status_code=400, detail=f"Query error: {str(e)}")
 
 
+def fetch_console_batch(con) -> tuple[bytes, int]:
+    """
+    Fetch and JSON-encode the next batch of console rows. Runs on _SQL_EXEC,
+    so neither the fetch nor the encoding blocks the event loop.
+    
+    Returns the encoded rows without the enclosing brackets (the stream
+    writes the rows array itself) and the number of rows in the batch.
+    """
+    batch = con.fetchmany(SQL_BATCH_ROWS)
+    return _json_list.dump_json(batch)[1:-1], len(batch)
+
+
+async def stream_console_rows(con, columns: list[str], batch: tuple[bytes, int]):
+    """Yield a SQLResponse JSON document, fetching further batches on _SQL_EXEC."""
+    pending = None
+    try:
+        yield b'{"columns":' + _json_list.dump_json(columns) + b',"rows":['
+        
+        row_count = 0
+        error = None
+        rows, batch_rows = batch
+        try:
+            while batch_rows:
+                if row_count:
+                    yield b","
+                yield rows
+                row_count += batch_rows
+                pending = _SQL_EXEC.submit(fetch_console_batch, con)
+                rows, batch_rows = await asyncio.wrap_future(pending)
+        except Exception as e:
+            # The 200 status and some rows are already sent, so report the
+            # failure inside the document rather than truncating it
+            error = f"Query error: {str(e)}"
+        
+        tail = b'],"row_count":' + str(row_count).encode()
+        if error is not None:
+            tail += b',"error":' + json.dumps(error).encode()
+        yield tail + b"}"
+    finally:
+        # If the client went away mid-fetch, close only once that fetch is done
+        if pending is not None:
+            pending.add_done_callback(lambda _: con.close())
+        else:
+            con.close()
+
+
 @app.get("/categories")
 def get_categories():
     """Get all unique categories for filter dropdown."""
-    result = execute_query("SELECT DISTINCT category FROM hk ORDER BY category")
-    return [row["category"] for row in result]
+    require_reference_data()
+    return _CATEGORIES
 
 
 @app.get("/regions")
 def get_regions():
     """Get all unique regions for filter dropdown."""
-    result = execute_query("SELECT DISTINCT region FROM hk ORDER BY region")
-    return [row["region"] for row in result]
+    require_reference_data()
+    return _REGIONS
 
 
-@app.get("/stats")
-def get_stats():
-    """Get completion statistics."""
+def add_completion_percent(row: dict) -> dict:
+    """Add a completion percentage to a stats row in place."""
+    row["completion_percent"] = round(
+        (row["found_count"] / row["total"]) * 100, 2
+    ) if row["total"] > 0 else 0
+    return row
+
+
+def compute_stats():
+    """
+    Compute overall, per-region and per-category statistics in a single
+    scan of hk using GROUPING SETS.
+    """
     result = execute_query("""
         SELECT 
+            GROUPING(region, category) as grouping_id,
+            region,
+            category,
             COUNT(*) as total,
             SUM(CASE WHEN found THEN 1 ELSE 0 END) as found_count,
             SUM(CASE WHEN NOT found THEN 1 ELSE 0 END) as not_found_count
         FROM hk
+        GROUP BY GROUPING SETS ((), (region), (category))
+        ORDER BY grouping_id, region, category
     """)
     
-    stats = result[0]
-    stats["completion_percent"] = round(
-        (stats["found_count"] / stats["total"]) * 100, 2
-    ) if stats["total"] > 0 else 0
+    # grouping_id has a bit set for each column rolled up in that row:
+    # 3 = overall, 1 = by region (category rolled up), 2 = by category
+    stats = {"totals": None, "by_region": [], "by_category": []}
+    for row in result:
+        grouping_id = row.pop("grouping_id")
+        if grouping_id == 3:
+            del row["region"], row["category"]
+            stats["totals"] = add_completion_percent(row)
+        elif grouping_id == 1:
+            del row["category"]
+            stats["by_region"].append(add_completion_percent(row))
+        else:
+            del row["region"]
+            stats["by_category"].append(add_completion_percent(row))
     
     return stats
 
 
+@app.get("/stats/all")
+def get_all_stats():
+    """
+    Get overall, per-region and per-category statistics in one response.
+    
+    Prefer this over calling the three endpoints below separately:
+    each of them runs the same full query.
+    """
+    return compute_stats()
+
+
+# The endpoints below serve slices of compute_stats(), so the aggregate
+# query lives in one place
+@app.get("/stats")
+def get_stats():
+    """Get completion statistics."""
+    return compute_stats()["totals"]
+
+
 @app.get("/stats/regions")
 def get_region_stats():
     """Get completion statistics grouped by region."""
-    result = execute_query("""
-        SELECT 
-            region,
-            COUNT(*) as total,
-            SUM(CASE WHEN found THEN 1 ELSE 0 END) as found_count,
-            SUM(CASE WHEN NOT found THEN 1 ELSE 0 END) as not_found_count
-        FROM hk
-        GROUP BY region
-        ORDER BY region
-    """)
-    
-    # Add completion percentage to each region
-    for row in result:
-        row["completion_percent"] = round(
-            (row["found_count"] / row["total"]) * 100, 2
-        ) if row["total"] > 0 else 0
-    
-    return result
+    return compute_stats()["by_region"]
 
 
 @app.get("/stats/categories")
 def get_category_stats():
     """Get completion statistics grouped by category."""
-    result = execute_query("""
-        SELECT 
-            category,
-            COUNT(*) as total,
-            SUM(CASE WHEN found THEN 1 ELSE 0 END) as found_count,
-            SUM(CASE WHEN NOT found THEN 1 ELSE 0 END) as not_found_count
-        FROM hk
-        GROUP BY category
-        ORDER BY category
-    """)
-    
-    # Add completion percentage to each category
-    for row in result:
-        row["completion_percent"] = round(
-            (row["found_count"] / row["total"]) * 100, 2
-        ) if row["total"] > 0 else 0
-    
-    return result
+    return compute_stats()["by_category"]
 
 
 # =============================================================================
 # Session Endpoints
 # =============================================================================
 
+def _ensure_id_default(con, table: str, sequence: str):
+    """
+    Attach a sequence as the id default of a table created before ids were
+    sequence-backed. The sequence is restarted past the existing ids.
+    """
+    default = con.execute(
+        "SELECT column_default FROM duckdb_columns() WHERE table_name = ? AND column_name = 'id'",
+        [table]
+    ).fetchone()[0]
+    if default is not None:
+        return
+    
+    next_id = con.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+    con.execute(f"DROP SEQUENCE IF EXISTS {sequence}")
+    con.execute(f"CREATE SEQUENCE {sequence} START {next_id}")
+    con.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+    # Flush to the database file: DuckDB cannot replay this ALTER from the WAL
+    con.execute("CHECKPOINT")
+
+
 def ensure_sessions_tables():
     """Create sessions tables if they don't exist."""
     con = get_connection()
-    try:
+    with _write_lock:
+        # Sequences must exist before the tables that default to them
+        con.execute("CREATE SEQUENCE IF NOT EXISTS sessions_id_seq START 1")
+        con.execute("CREATE SEQUENCE IF NOT EXISTS session_items_id_seq START 1")
         # Sessions table
         con.execute("""
             CREATE TABLE IF NOT EXISTS sessions (
-                id INTEGER PRIMARY KEY,
+                id INTEGER PRIMARY KEY DEFAULT nextval('sessions_id_seq'),
                 name VARCHAR,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 saved_at TIMESTAMP
@@ -347,36 +635,46 @@ def ensure_sessions_tables():
         # Session items table (many-to-many relationship)
         con.execute("""
             CREATE TABLE IF NOT EXISTS session_items (
-                id INTEGER PRIMARY KEY,
+                id INTEGER PRIMARY KEY DEFAULT nextval('session_items_id_seq'),
                 session_id INTEGER NOT NULL,
                 item_id INTEGER NOT NULL,
                 added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 UNIQUE(session_id, item_id)
             )
         """)
-        # Create sequence for sessions if not exists
-        try:
-            con.execute("CREATE SEQUENCE IF NOT EXISTS sessions_id_seq START 1")
-        except:
-            pass
-        try:
-            con.execute("CREATE SEQUENCE IF NOT EXISTS session_items_id_seq START 1")
-        except:
-            pass
-    finally:
-        con.close()
+        # Databases created by older versions have no id defaults yet
+        _ensure_id_default(con, "sessions", "sessions_id_seq")
+        _ensure_id_default(con, "session_items", "session_items_id_seq")
+        # Lookups and joins by session, and "which sessions contain this item"
+        con.execute("CREATE INDEX IF NOT EXISTS idx_si_session ON session_items(session_id)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_si_item ON session_items(item_id)")
 
 
-# Ensure tables exist on startup
+# Ensure tables exist and warm caches on startup (once per process, not per request)
 @app.on_event("startup")
 def startup_event():
+    global _DB
+    if _DB is None:
+        _DB = open_database()
     ensure_sessions_tables()
+    # Don't fail startup if hk isn't there yet; the caches load on first use
+    ensure_reference_data()
 
 
-@app.get("/sessions")
+# Flush the WAL into the database file and release it on a clean shutdown
+@app.on_event("shutdown")
+def shutdown_event():
+    global _DB, _reference_loaded
+    with _write_lock:
+        _reference_loaded = False
+        _DB.execute("FORCE CHECKPOINT")
+        _DB.close()
+        _DB = None
+
+
+@app.get("/sessions", response_model=list[SessionSummary])
 def get_sessions():
     """Get all sessions (both active and saved)."""
-    ensure_sessions_tables()
     result = execute_query("""
         SELECT 
             s.id,
@@ -392,54 +690,43 @@ def get_sessions():
     return result
 
 
-@app.post("/sessions")
+@app.post("/sessions", response_model=SessionSummary)
 def create_session(session: SessionCreate):
     """Create a new session."""
-    ensure_sessions_tables()
-    con = get_connection()
-    try:
-        # Get next ID
-        result = con.execute("SELECT COALESCE(MAX(id), 0) + 1 as next_id FROM sessions").fetchone()
-        next_id = result[0]
-        
-        name = session.name or f"Session {next_id}"
-        created_at = datetime.now().isoformat()
-        
-        con.execute(
-            "INSERT INTO sessions (id, name, created_at) VALUES (?, ?, ?)",
-            [next_id, name, created_at]
-        )
-        
-        return {"id": next_id, "name": name, "created_at": created_at, "saved_at": None, "item_count": 0}
-    finally:
-        con.close()
+    # Draw the ID from the sequence so the default name can reference it;
+    # created_at comes from the column default
+    created = execute_write("""
+        INSERT INTO sessions (id, name)
+        SELECT id, COALESCE(?, 'Session ' || id)
+        FROM (SELECT nextval('sessions_id_seq') AS id)
+        RETURNING id, name, created_at, saved_at
+    """, [session.name or None], returning=True)[0]
+    
+    created["item_count"] = 0
+    return created
 
 
-@app.get("/sessions/{session_id}")
+@app.get("/sessions/{session_id}", response_model=SessionDetail)
 def get_session(session_id: int):
     """Get a session with its items."""
-    ensure_sessions_tables()
     # Get session info
-    session_result = execute_query(
-        "SELECT id, name, created_at, saved_at FROM sessions WHERE id = ?",
-        [session_id]
-    )
+    session_result = execute_prepared("get_session", [session_id])
     
     if not session_result:
         raise HTTPException(status_code=404, detail="Session not found")
     
     session = session_result[0]
     
-    # Get items in this session
-    items = execute_query("""
-        SELECT 
-            h.id, h.found, h.name, h.category, h.region, h.information, h.location_url,
-            si.added_at
-        FROM session_items si
-        JOIN hk h ON si.item_id = h.id
-        WHERE si.session_id = ?
-        ORDER BY si.added_at
-    """, [session_id])
+    # Get items in this session, filling in item details from memory
+    # rather than joining hk
+    rows = execute_prepared("get_session_items", [session_id])
+    if rows:
+        require_reference_data()
+    items = [
+        {**_ITEMS_STATIC_BY_ID[row["item_id"]], "found": _FOUND[row["item_id"]], "added_at": row["added_at"]}
+        for row in rows
+        if row["item_id"] in _ITEMS_STATIC_BY_ID
+    ]
     
     session["items"] = items
     session["item_count"] = len(items)
@@ -450,125 +737,115 @@ def get_session(session_id: int):
 @app.delete("/sessions/{session_id}")
 def delete_session(session_id: int):
     """Delete a session and its items."""
-    ensure_sessions_tables()
-    # Verify session exists
-    existing = execute_query("SELECT id FROM sessions WHERE id = ?", [session_id])
-    if not existing:
+    # Delete session; no row returned means it didn't exist
+    deleted = execute_write("DELETE FROM sessions WHERE id = ? RETURNING id", [session_id], returning=True)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Delete session items first
+    # Delete its items
     execute_write("DELETE FROM session_items WHERE session_id = ?", [session_id])
-    # Delete session
-    execute_write("DELETE FROM sessions WHERE id = ?", [session_id])
     
     return {"message": "Session deleted", "id": session_id}
 
 
-@app.post("/sessions/{session_id}/save")
+@app.post("/sessions/{session_id}/save", response_model=SessionAck)
 def save_session(session_id: int):
     """Mark a session as saved (finalized)."""
-    ensure_sessions_tables()
-    # Verify session exists
-    existing = execute_query("SELECT id FROM sessions WHERE id = ?", [session_id])
-    if not existing:
+    saved = execute_write(
+        "UPDATE sessions SET saved_at = CURRENT_TIMESTAMP WHERE id = ? RETURNING id",
+        [session_id],
+        returning=True
+    )
+    if not saved:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    saved_at = datetime.now().isoformat()
-    execute_write(
-        "UPDATE sessions SET saved_at = ? WHERE id = ?",
-        [saved_at, session_id]
-    )
+    return session_ack(session_id)
+
+
+def session_ack(session_id: int, item_count: Optional[int] = None):
+    """
+    Build the minimal response returned by session mutations.
     
-    return get_session(session_id)
+    Clients that need the full item list re-fetch GET /sessions/{id}
+    once, instead of every mutation paying for the session + items join.
+    """
+    if item_count is None:
+        item_count = get_connection().execute(
+            "SELECT COUNT(*) FROM session_items WHERE session_id = ?", [session_id]
+        ).fetchone()[0]
+    return {"ok": True, "session_id": session_id, "item_count": item_count}
 
 
-@app.post("/sessions/{session_id}/items")
-def add_session_item(session_id: int, item: SessionItemAdd):
-    """Add an item to a session."""
-    ensure_sessions_tables()
-    # Verify session exists
-    session = execute_query("SELECT id, saved_at FROM sessions WHERE id = ?", [session_id])
+def check_session_open(session_id: int):
+    """
+    Raise if a session is missing (404) or already saved (400).
+    
+    Mutations are written to match only open sessions, so this lookup is
+    only needed to explain why a mutation matched no rows.
+    """
+    session = execute_prepared("get_session_state", [session_id])
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Check if session is already saved
     if session[0]["saved_at"]:
         raise HTTPException(status_code=400, detail="Cannot modify a saved session")
-    
-    # Verify item exists
-    item_exists = execute_query("SELECT id FROM hk WHERE id = ?", [item.item_id])
-    if not item_exists:
-        raise HTTPException(status_code=404, detail="Item not found")
-    
-    # Check if item already in session
-    existing = execute_query(
-        "SELECT id FROM session_items WHERE session_id = ? AND item_id = ?",
-        [session_id, item.item_id]
-    )
-    if existing:
+
+
+@app.post("/sessions/{session_id}/items", response_model=SessionAck)
+def add_session_item(session_id: int, item: SessionItemAdd):
+    """Add an item to a session."""
+    # Insert only if the session is open and the item exists;
+    # the UNIQUE(session_id, item_id) constraint rejects duplicates
+    try:
+        added = execute_write("""
+            INSERT INTO session_items (session_id, item_id)
+            SELECT s.id, h.id
+            FROM sessions s, hk h
+            WHERE s.id = ? AND s.saved_at IS NULL AND h.id = ?
+            RETURNING id
+        """, [session_id, item.item_id], returning=True)
+    except duckdb.ConstraintException:
         raise HTTPException(status_code=400, detail="Item already in session")
     
-    con = get_connection()
-    try:
-        # Get next ID
-        result = con.execute("SELECT COALESCE(MAX(id), 0) + 1 as next_id FROM session_items").fetchone()
-        next_id = result[0]
-        
-        con.execute(
-            "INSERT INTO session_items (id, session_id, item_id, added_at) VALUES (?, ?, ?, ?)",
-            [next_id, session_id, item.item_id, datetime.now().isoformat()]
-        )
-    finally:
-        con.close()
+    if not added:
+        check_session_open(session_id)
+        raise HTTPException(status_code=404, detail="Item not found")
     
-    return get_session(session_id)
+    return session_ack(session_id)
 
 
-@app.delete("/sessions/{session_id}/items/{item_id}")
+@app.delete("/sessions/{session_id}/items/{item_id}", response_model=SessionAck)
 def remove_session_item(session_id: int, item_id: int):
     """Remove an item from a session."""
-    ensure_sessions_tables()
-    # Verify session exists
-    session = execute_query("SELECT id, saved_at FROM sessions WHERE id = ?", [session_id])
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Check if session is already saved
-    if session[0]["saved_at"]:
-        raise HTTPException(status_code=400, detail="Cannot modify a saved session")
-    
-    # Verify item is in session
-    existing = execute_query(
-        "SELECT id FROM session_items WHERE session_id = ? AND item_id = ?",
-        [session_id, item_id]
-    )
-    if not existing:
+    removed = execute_write("""
+        DELETE FROM session_items
+        WHERE session_id = ? AND item_id = ?
+          AND session_id IN (SELECT id FROM sessions WHERE saved_at IS NULL)
+        RETURNING id
+    """, [session_id, item_id], returning=True)
+    
+    if not removed:
+        check_session_open(session_id)
         raise HTTPException(status_code=404, detail="Item not in session")
     
-    execute_write(
-        "DELETE FROM session_items WHERE session_id = ? AND item_id = ?",
-        [session_id, item_id]
-    )
-    
-    return get_session(session_id)
+    return session_ack(session_id)
 
 
-@app.post("/sessions/{session_id}/clear")
+@app.post("/sessions/{session_id}/clear", response_model=SessionAck)
 def clear_session(session_id: int):
     """Remove all items from a session."""
-    ensure_sessions_tables()
-    # Verify session exists
-    session = execute_query("SELECT id, saved_at FROM sessions WHERE id = ?", [session_id])
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Check if session is already saved
-    if session[0]["saved_at"]:
-        raise HTTPException(status_code=400, detail="Cannot modify a saved session")
-    
-    execute_write("DELETE FROM session_items WHERE session_id = ?", [session_id])
-    
-    return get_session(session_id)
+    cleared = execute_write("""
+        DELETE FROM session_items
+        WHERE session_id = ?
+          AND session_id IN (SELECT id FROM sessions WHERE saved_at IS NULL)
+        RETURNING id
+    """, [session_id], returning=True)
+    
+    # Nothing deleted: either already empty, or missing/saved
+    if not cleared:
+        check_session_open(session_id)
+    
+    return session_ack(session_id, item_count=0)
 
 
 # =============================================================================
@@ -5,7 +5,7 @@
  * In development: Uses Vite proxy or direct localhost:8000
  */
 
-import { HKItem, Filters, Stats, SQLResult, RegionStats, CategoryStats, Session } from './types'
+import { HKItem, Filters, Stats, AllStats, SQLResult, RegionStats, CategoryStats, Session, SessionAck } from './types'
 
 // Use /api prefix in production (nginx proxies to backend)
 // In dev mode, Vite proxies /api to localhost:8000
@@ -76,7 +76,13 @@ export async function executeSQL(query: string): Promise<SQLResult> {
     throw new Error(errorData.detail || `Query failed: ${response.statusText}`)
   }
 
-  return response.json()
+  // Failures after the results started streaming arrive in the body
+  const data: SQLResult = await response.json()
+  if (data.error) {
+    throw new Error(data.error)
+  }
+
+  return data
 }
 
 /**
@@ -92,6 +98,19 @@ export async function fetchStats(): Promise<Stats> {
   return response.json()
 }
 
+/**
+ * Fetch overall, region and category statistics in a single request
+ */
+export async function fetchAllStats(): Promise<AllStats> {
+  const response = await fetch(`${API_BASE}/stats/all`)
+  
+  if (!response.ok) {
+    throw new Error(`Failed to fetch stats: ${response.statusText}`)
+  }
+  
+  return response.json()
+}
+
 /**
  * Fetch completion statistics by region
  */
@@ -209,7 +228,7 @@ export async function deleteSession(sessionId: number): Promise<void> {
 /**
  * Save (finalize) a session
  */
-export async function saveSession(sessionId: number): Promise<Session> {
+export async function saveSession(sessionId: number): Promise<SessionAck> {
   const response = await fetch(`${API_BASE}/sessions/${sessionId}/save`, {
     method: 'POST'
   })
@@ -224,7 +243,7 @@ export async function saveSession(sessionId: number): Promise<Session> {
 /**
  * Add an item to a session
  */
-export async function addSessionItem(sessionId: number, itemId: number): Promise<Session> {
+export async function addSessionItem(sessionId: number, itemId: number): Promise<SessionAck> {
   const response = await fetch(`${API_BASE}/sessions/${sessionId}/items`, {
     method: 'POST',
     headers: {
@@ -244,7 +263,7 @@ export async function addSessionItem(sessionId: number, itemId: number): Promise
 /**
  * Remove an item from a session
  */
-export async function removeSessionItem(sessionId: number, itemId: number): Promise<Session> {
+export async function removeSessionItem(sessionId: number, itemId: number): Promise<SessionAck> {
   const response = await fetch(`${API_BASE}/sessions/${sessionId}/items/${itemId}`, {
     method: 'DELETE'
   })
@@ -259,7 +278,7 @@ export async function removeSessionItem(sessionId: number, itemId: number): Prom
 /**
  * Clear all items from a session
  */
-export async function clearSession(sessionId: number): Promise<Session> {
+export async function clearSession(sessionId: number): Promise<SessionAck> {
   const response = await fetch(`${API_BASE}/sessions/${sessionId}/clear`, {
     method: 'POST'
   })
@@ -12,7 +12,7 @@ import { useState, useEffect, useMemo } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { ProgressBar } from '../components/ProgressBar'
 import { Stats, RegionStats, CategoryStats } from '../types'
-import { fetchStats, fetchRegionStats, fetchCategoryStats } from '../api'
+import { fetchAllStats } from '../api'
 import './Overview.css'
 
 export function Overview() {
@@ -39,14 +39,10 @@ export function Overview() {
       setLoading(true)
       setError(null)
       try {
-        const [statsData, regionData, categoryData] = await Promise.all([
-          fetchStats(),
-          fetchRegionStats(),
-          fetchCategoryStats()
-        ])
-        setStats(statsData)
-        setRegionStats(regionData)
-        setCategoryStats(categoryData)
+        const data = await fetchAllStats()
+        setStats(data.totals)
+        setRegionStats(data.by_region)
+        setCategoryStats(data.by_category)
       } catch (err) {
         setError(err instanceof Error ? err.message : 'Failed to load statistics')
       } finally {
@@ -10,7 +10,7 @@
 
 import { useState, useEffect, useCallback } from 'react'
 import { 
-  Session, HKItem 
+  Session, SessionAck, HKItem 
 } from '../types'
 import { 
   fetchSessions, 
@@ -120,12 +120,21 @@ export function SessionPage() {
     }
   }
 
+  // Apply a mutation's item count to the sessions list without re-fetching it
+  const applyAck = (ack: SessionAck) => {
+    setSessions(prev => prev.map(s => 
+      s.id === ack.session_id ? { ...s, item_count: ack.item_count } : s
+    ))
+  }
+
   // Save session
   const handleSaveSession = async () => {
     if (!activeSession) return
     
     try {
-      const saved = await saveSession(activeSession.id)
+      await saveSession(activeSession.id)
+      // Saving moves the session to history, so re-fetch both views once
+      const saved = await fetchSession(activeSession.id)
       setActiveSession(saved)
       await loadSessions()
     } catch (err) {
@@ -134,13 +143,17 @@ export function SessionPage() {
   }
 
   // Add item to session
-  const handleAddItem = async (itemId: number) => {
+  const handleAddItem = async (item: HKItem) => {
     if (!activeSession) return
     
     try {
-      const updated = await addSessionItem(activeSession.id, itemId)
-      setActiveSession(updated)
-      await loadSessions()
+      const ack = await addSessionItem(activeSession.id, item.id)
+      setActiveSession(prev => prev && {
+        ...prev,
+        item_count: ack.item_count,
+        items: [...(prev.items ?? []), { ...item, added_at: new Date().toISOString() }]
+      })
+      applyAck(ack)
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to add item')
     }
@@ -151,9 +164,13 @@ export function SessionPage() {
     if (!activeSession) return
     
     try {
-      const updated = await removeSessionItem(activeSession.id, itemId)
-      setActiveSession(updated)
-      await loadSessions()
+      const ack = await removeSessionItem(activeSession.id, itemId)
+      setActiveSession(prev => prev && {
+        ...prev,
+        item_count: ack.item_count,
+        items: prev.items?.filter(i => i.id !== itemId)
+      })
+      applyAck(ack)
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to remove item')
     }
@@ -165,9 +182,9 @@ export function SessionPage() {
     if (!confirm('Are you sure you want to clear all items from this session?')) return
     
     try {
-      const updated = await clearSession(activeSession.id)
-      setActiveSession(updated)
-      await loadSessions()
+      const ack = await clearSession(activeSession.id)
+      setActiveSession(prev => prev && { ...prev, item_count: ack.item_count, items: [] })
+      applyAck(ack)
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to clear session')
     }
@@ -504,7 +521,7 @@ export function SessionPage() {
                             <td>
                               <button 
                                 className="btn-add-item"
-                                onClick={() => handleAddItem(item.id)}
+                                onClick={() => handleAddItem(item)}
                               >
                                 Add
                               </button>
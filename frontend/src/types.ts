@@ -42,6 +42,12 @@ export interface CategoryStats {
   completion_percent: number
 }
 
+export interface AllStats {
+  totals: Stats
+  by_region: RegionStats[]
+  by_category: CategoryStats[]
+}
+
 export interface SessionItem extends HKItem {
   added_at: string
 }
@@ -55,8 +61,15 @@ export interface Session {
   items?: SessionItem[]
 }
 
+export interface SessionAck {
+  ok: boolean
+  session_id: number
+  item_count: number
+}
+
 export interface SQLResult {
   columns: string[]
   rows: unknown[][]
   row_count: number
+  error?: string
 }
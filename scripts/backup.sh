@@ -38,11 +38,13 @@ if docker volume inspect "$VOLUME_NAME" &>/dev/null; then
     echo "   Copying from volume: $VOLUME_NAME"
     
     # Use a temporary container to copy the file from the volume
+    # Take the WAL too if one exists, since it may hold the latest writes
     docker run --rm \
         -v "$VOLUME_NAME":/data:ro \
         -v "$BACKUP_DIR":/backup \
         alpine \
-        cp /data/$DB_NAME "/backup/${BACKUP_NAME}.db"
+        sh -c "cp /data/$DB_NAME '/backup/${BACKUP_NAME}.db' && \
+               if [ -f /data/$DB_NAME.wal ]; then cp /data/$DB_NAME.wal '/backup/${BACKUP_NAME}.db.wal'; fi"
     
     echo "✅ Backup created: $BACKUP_FILE"
 else
@@ -53,6 +55,10 @@ else
         echo "📁 Local mode detected"
         echo "   Copying from: $LOCAL_DB"
         cp "$LOCAL_DB" "$BACKUP_FILE"
+        # Take the WAL too if one exists, since it may hold the latest writes
+        if [ -f "$LOCAL_DB.wal" ]; then
+            cp "$LOCAL_DB.wal" "$BACKUP_FILE.wal"
+        fi
         echo "✅ Backup created: $BACKUP_FILE"
     else
         echo "❌ Error: Database not found"
@@ -7,6 +7,8 @@ Parses the markdown checklist and creates the DuckDB database.
 import sys
 from pathlib import Path
 
+import duckdb
+
 # Add scripts directory to path for imports
 sys.path.insert(0, '/app/scripts')
 
@@ -23,10 +25,14 @@ def main():
     
     print(f'Parsing checklist from: {CHECKLIST_PATH}')
     entries = parse_markdown_table(str(CHECKLIST_PATH))
-    print(f'Found {len(entries)} entries')
+    print(f"Found {len(entries['name'])} entries")
     
     print(f'Creating database at: {DB_PATH}')
-    create_database(str(DB_PATH), entries)
+    con = duckdb.connect(str(DB_PATH))
+    try:
+        create_database(con, entries)
+    finally:
+        con.close()
     print('Database initialized successfully!')
 
 if __name__ == '__main__':
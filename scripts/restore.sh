@@ -65,11 +65,16 @@ if docker volume inspect "$VOLUME_NAME" &>/dev/null; then
     docker stop hk-backend 2>/dev/null || true
     
     # Use a temporary container to copy the file to the volume
+    # Replace the WAL along with the database: a stale one left next to the
+    # restored file would be replayed on the next open. Mount the backup's
+    # directory so its .wal (if any) is visible too.
     docker run --rm \
         -v "$VOLUME_NAME":/data \
-        -v "$(realpath "$BACKUP_FILE")":/backup.db:ro \
+        -v "$(dirname "$(realpath "$BACKUP_FILE")")":/backup:ro \
         alpine \
-        cp /backup.db /data/$DB_NAME
+        sh -c "cp '/backup/$(basename "$BACKUP_FILE")' /data/$DB_NAME && \
+               rm -f /data/$DB_NAME.wal && \
+               if [ -f '/backup/$(basename "$BACKUP_FILE").wal' ]; then cp '/backup/$(basename "$BACKUP_FILE").wal' /data/$DB_NAME.wal; fi"
     
     # Restart the backend
     echo "   Restarting backend container..."
@@ -85,6 +90,12 @@ else
     
     mkdir -p "$(dirname "$LOCAL_DB")"
     cp "$BACKUP_FILE" "$LOCAL_DB"
+    # Replace the WAL along with the database: a stale one left next to the
+    # restored file would be replayed on the next open
+    rm -f "$LOCAL_DB.wal"
+    if [ -f "$BACKUP_FILE.wal" ]; then
+        cp "$BACKUP_FILE.wal" "$LOCAL_DB.wal"
+    fi
     
     echo "✅ Database restored from: $BACKUP_FILE"
 fi